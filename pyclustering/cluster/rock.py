@@ -1,276 +1,489 @@
-"""!
-@brief Cluster analysis algorithm: ROCK
-@details Implementation based on paper @cite inproceedings::rock::1.
-@authors Andrei Novikov (pyclustering@yandex.ru)
-@date 2014-2020
-@copyright BSD-3-Clause
-"""
-
-
-from pyclustering.cluster.encoder import type_encoding
-
-from pyclustering.utils import euclidean_distance
-
-from pyclustering.core.wrapper import ccore_library
-
-import pyclustering.core.rock_wrapper as wrapper
-
-def jaccard_similarity(point1, point2):
-    intersection = len(list(set(point1).intersection(point2)))
-    union = (len(point1) + len(point2)) - intersection
-    return float(intersection) / union
-
-def print_tidy_nested_list(nested_list):
-    for inner_list in nested_list:
-        for element in inner_list:
-            print(f"{element} ", end='')
-        print()
-
-class rock:
-    """!
-    @brief The class represents clustering algorithm ROCK.
-    Example:
-    @code
-        from pyclustering.cluster import cluster_visualizer
-        from pyclustering.cluster.rock import rock
-        from pyclustering.samples.definitions import FCPS_SAMPLES
-        from pyclustering.utils import read_sample
-        # Read sample for clustering from file.
-        sample = read_sample(FCPS_SAMPLES.SAMPLE_HEPTA)
-        # Create instance of ROCK algorithm for cluster analysis. Seven clusters should be allocated.
-        rock_instance = rock(sample, 1.0, 7)
-        # Run cluster analysis.
-        rock_instance.process()
-        # Obtain results of clustering.
-        clusters = rock_instance.get_clusters()
-        # Visualize clustering results.
-        visualizer = cluster_visualizer()
-        visualizer.append_clusters(clusters, sample)
-        visualizer.show()
-    @endcode
-       
-    """
-    
-    def __init__(self, data, number_clusters, metric_function='jaccard_similarity', theta=0.5, matrix_verbose=False, ccore=False):
-        """!
-        @brief Constructor of clustering algorithm ROCK.
-        
-        @param[in] data (list): Input data - list of points where each point is represented by list of coordinates.
-        @param[in] number_clusters (uint): Defines number of clusters that should be allocated from the input data set.
-        @param[in] theta (double): Value that defines degree of normalization that influences on choice of clusters for merging during processing.
-        @param[in] ccore (bool): Defines should be CCORE (C++ pyclustering library) used instead of Python code or not.
-        
-        """
-        
-        self.__pointer_data = data
-        self.__number_clusters = number_clusters
-        self.__metric_function = metric_function
-        self.__theta = theta    
-        self.__matrix_verbose = matrix_verbose
-        
-        self.__clusters = None
-        
-        self.__ccore = ccore
-        if self.__ccore:
-            self.__ccore = ccore_library.workable()
-
-        self.__degree_normalization = 1.0 + 2.0 * ((1.0 - theta) / (1.0 + theta))
-
-        self.__neighbours_matrix = None
-        self.__create_neighbours_matrix()
-        self.__links_matrix = None
-        self.__create_links_matrix()
-
-        self.__goodness_per_cluster = []
-        if self.__matrix_verbose == True:
-            print('==> Neighbours Matrix...')
-            print_tidy_nested_list(self.__neighbours_matrix)
-            print('==> Links Matrix...')
-            print_tidy_nested_list(self.__links_matrix)
-       # print(self.__neighbours_matrix)
-       # print(self.__links_matrix)
-       # print(self.__links_matrix == self.__neighbours_matrix)
-
-
-    def process(self):
-        """!
-        @brief Performs cluster analysis in line with rules of ROCK algorithm.
-        @return (rock) Returns itself (ROCK instance).
-        
-        @see get_clusters()
-        
-        """
-        
-        # TODO: (Not related to specification, just idea) First iteration should be investigated. Euclidean distance should be used for clustering between two 
-        # points and rock algorithm between clusters because we consider non-categorical samples. But it is required more investigations.
-        
-        if self.__ccore is True:
-            self.__clusters = wrapper.rock(self.__pointer_data, self.__theta, self.__number_clusters, self.__theta)
-        
-        else:  
-            self.__clusters = [[index] for index in range(len(self.__pointer_data))]
-            
-            while len(self.__clusters) > self.__number_clusters:
-                indexes = self.__find_pair_clusters(self.__clusters)
-                
-                if indexes != [-1, -1]:
-                    self.__clusters[indexes[0]] += self.__clusters[indexes[1]]
-                    self.__clusters.pop(indexes[1])   # remove merged cluster.
-                else:
-                    break  # totally separated clusters have been allocated
-        for i in range(0, len(self.__clusters)):
-            cluster = self.__clusters[i]
-            cluster_goodness_for_this_cluster = 0
-            for j in range(0, len(cluster)):
-                for k in range(0, j-1):
-                    # ni*sum(link(p,q)/ni^(1+2f(theta)))
-                    cluster_goodness_for_this_cluster += self.__links_matrix[j][k]
-            cluster_goodness_for_this_cluster = len(cluster) * cluster_goodness_for_this_cluster / (len(cluster) ** self.__degree_normalization)
-            self.__goodness_per_cluster.append(cluster_goodness_for_this_cluster)
-        return self
-
-    
-    def get_clusters(self):
-        """!
-        @brief Returns list of allocated clusters, each cluster contains indexes of objects in list of data.
-        
-        @return (list) List of allocated clusters, each cluster contains indexes of objects in list of data.
-        
-        @see process()
-        
-        """
-        
-        return self.__clusters
-    
-
-    def get_goodness_per_cluster(self):
-        return self.__goodness_per_cluster
-
-
-    def get_cluster_encoding(self):
-        """!
-        @brief Returns clustering result representation type that indicate how clusters are encoded.
-        
-        @return (type_encoding) Clustering result representation.
-        
-        @see get_clusters()
-        
-        """
-        
-        return type_encoding.CLUSTER_INDEX_LIST_SEPARATION
-
-
-    def __find_pair_clusters(self, clusters):
-        """!
-        @brief Returns pair of clusters that are best candidates for merging in line with goodness measure.
-               The pair of clusters for which the above goodness measure is maximum is the best pair of clusters to be merged.
-               
-        @param[in] clusters (list): List of clusters that have been allocated during processing, each cluster is represented by list of indexes of points from the input data set.
-        
-        @return (list) List that contains two indexes of clusters (from list 'clusters') that should be merged on this step.
-                It can be equals to [-1, -1] when no links between clusters.
-        
-        """
-        
-        maximum_goodness = 0.0
-        cluster_indexes = [-1, -1]
-        
-        for i in range(0, len(clusters)):
-            for j in range(i + 1, len(clusters)):
-                goodness = self.__calculate_goodness(clusters[i], clusters[j])
-                if goodness > maximum_goodness:
-                    maximum_goodness = goodness
-                    cluster_indexes = [i, j]
-        
-        return cluster_indexes
-
-
-    def __calculate_links(self, cluster1, cluster2):
-        """!
-        @brief Returns number of link between two clusters. 
-        @details Link between objects (points) exists only if distance between them less than connectivity radius.
-        
-        @param[in] cluster1 (list): The first cluster.
-        @param[in] cluster2 (list): The second cluster.
-        
-        @return (uint) Number of links between two clusters.
-        
-        """
-        
-        number_links = 0
-        
-        for index1 in cluster1:
-            for index2 in cluster2:
-                number_links += self.__links_matrix[index1][index2]
-                
-        return number_links
-            
-
-    def __create_neighbours_matrix(self):
-        """!
-        @brief Creates 2D neibours matrix (list of lists) where each element described existence of link between points (means that points are neighbors).
-        
-        """
-        
-        size_data = len(self.__pointer_data)
-        
-        self.__neighbours_matrix = [[0 for i in range(size_data)] for j in range(size_data)]
-        for i in range(0, size_data):
-            for j in range(i + 1, size_data):
-                if self.__metric_function == 'jaccard_similarity':
-                    similarity = jaccard_similarity(self.__pointer_data[i], self.__pointer_data[j])
-                    if (similarity >= self.__theta):
-                        self.__neighbours_matrix[i][j] = 1
-                        self.__neighbours_matrix[j][i] = 1
-                else:
-                    distance = euclidean_distance(self.__pointer_data[i], self.__pointer_data[j])
-                    if (distance <= self.__theta):
-                        self.__neighbours_matrix[i][j] = 1
-                        self.__neighbours_matrix[j][i] = 1
-        
-    
-    def __create_links_matrix(self):
-        """!
-        @brief Creates 2D links matrix (list of lists) where each element described links between two points
-        
-        """
-        size_data = len(self.__pointer_data)
-        self.__links_matrix = [[0 for i in range(size_data)] for j in range(size_data)]
-        for i in range(0, size_data):
-            for j in range(0, size_data):
-                for l in range(0, size_data):
-                    self.__links_matrix[i][j] += self.__neighbours_matrix[i][l] * self.__neighbours_matrix[l][j]
-
-    def __calculate_goodness(self, cluster1, cluster2):
-        """!
-        @brief Calculates coefficient 'goodness measurement' between two clusters. The coefficient defines level of suitability of clusters for merging.
-        
-        @param[in] cluster1 (list): The first cluster.
-        @param[in] cluster2 (list): The second cluster.
-        
-        @return Goodness measure between two clusters.
-        
-        """
-        
-        number_links = self.__calculate_links(cluster1, cluster2)
-        devider = (len(cluster1) + len(cluster2)) ** self.__degree_normalization - len(cluster1) ** self.__degree_normalization - len(cluster2) ** self.__degree_normalization
-        
-        return number_links / devider
-
-
-    def __verify_arguments(self):
-        """!
-        @brief Verify input parameters for the algorithm and throw exception in case of incorrectness.
-        """
-        if len(self.__pointer_data) == 0:
-            raise ValueError("Input data is empty (size: '%d')." % len(self.__pointer_data))
-
-        if self.__theta < 0:
-            raise ValueError("Connectivity radius (current value: '%d') should be greater or equal to 0." % self.__theta)
-
-        if self.__theta < 0 or self.__theta > 1:
-            raise ValueError("theta (current value: '%d') should be in range (0, 1)." % self.__theta)
-
-        if (self.__number_clusters is not None) and (self.__number_clusters <= 0):
-            raise ValueError("Amount of clusters (current value: '%d') should be greater than 0." %
+"""!
+@brief Cluster analysis algorithm: ROCK
+@details Implementation based on paper @cite inproceedings::rock::1.
+@authors Andrei Novikov (pyclustering@yandex.ru)
+@date 2014-2020
+@copyright BSD-3-Clause
+"""
+
+
+import sys
+
+import numpy
+
+from scipy.linalg.blas import dsyrk
+from scipy.spatial.distance import pdist, squareform
+
+from pyclustering.cluster.encoder import type_encoding
+
+from pyclustering.utils import euclidean_distance
+
+from pyclustering.core.wrapper import ccore_library
+
+import pyclustering.core.rock_wrapper as wrapper
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _find_best_pair(cluster_links, sizes, size_pow, degree_normalization, live):
+    """!
+    @brief Scans the cluster links matrix for the pair of clusters with maximum goodness measure.
+    @details Written as plain loops over contiguous ndarrays so that it can be compiled by numba when available.
+
+    @param[in] cluster_links (numpy.ndarray): Matrix of links between current clusters.
+    @param[in] sizes (numpy.ndarray): Sizes of current clusters.
+    @param[in] size_pow (numpy.ndarray): Sizes raised to the degree of normalization.
+    @param[in] degree_normalization (double): Degree of normalization 1 + 2 * (1 - theta) / (1 + theta).
+    @param[in] live (numpy.ndarray): Boolean mask of clusters that have not been merged away.
+
+    @return (tuple) Pair of cluster indexes with maximum goodness, (-1, -1) when no links between clusters.
+
+    """
+
+    best_goodness = 0.0
+    best_index1, best_index2 = -1, -1
+
+    for i in range(cluster_links.shape[0]):
+        if not live[i]:
+            continue
+        for j in range(i + 1, cluster_links.shape[0]):
+            if not live[j] or cluster_links[i, j] <= 0.0:
+                continue
+
+            devider = (sizes[i] + sizes[j]) ** degree_normalization - size_pow[i] - size_pow[j]
+            goodness = cluster_links[i, j] / devider
+            if goodness > best_goodness:
+                best_goodness = goodness
+                best_index1, best_index2 = i, j
+
+    return best_index1, best_index2
+
+
+if NUMBA_AVAILABLE:
+    _find_best_pair = numba.njit(cache=True, fastmath=True)(_find_best_pair)
+
+
+    @numba.njit(inline='always')
+    def _popcount64(word):
+        """!
+        @brief Counts set bits of uint64 word using the SWAR algorithm, numba has no popcount intrinsic.
+
+        """
+
+        word = word - ((word >> numpy.uint64(1)) & numpy.uint64(0x5555555555555555))
+        word = (word & numpy.uint64(0x3333333333333333)) + ((word >> numpy.uint64(2)) & numpy.uint64(0x3333333333333333))
+        word = (word + (word >> numpy.uint64(4))) & numpy.uint64(0x0F0F0F0F0F0F0F0F)
+        return (word * numpy.uint64(0x0101010101010101)) >> numpy.uint64(56)
+
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _build_neighbours_euclidean(data, theta, out):
+        """!
+        @brief Fills symmetric neighbours matrix 'out' for numeric points, parallelized over rows.
+
+        @param[in] data (numpy.ndarray): Contiguous matrix of points of shape (amount of points, dimension).
+        @param[in] theta (double): Connectivity radius.
+        @param[out] out (numpy.ndarray): Preallocated uint8 matrix of shape (amount of points, amount of points).
+
+        """
+
+        theta2 = theta * theta   # compare squared distances, no sqrt per pair
+        for i in numba.prange(data.shape[0]):
+            for j in range(i + 1, data.shape[0]):
+                distance = 0.0
+                for k in range(data.shape[1]):
+                    difference = data[i, k] - data[j, k]
+                    distance += difference * difference
+
+                if distance <= theta2:
+                    out[i, j] = 1
+                    out[j, i] = 1
+
+
+    @numba.njit(parallel=True, cache=True)
+    def _build_neighbours_jaccard(bitsets, theta, out):
+        """!
+        @brief Fills symmetric neighbours matrix 'out' for bitset-encoded points, parallelized over rows.
+
+        @param[in] bitsets (numpy.ndarray): Bitsets of points produced by _build_bitsets().
+        @param[in] theta (double): Similarity threshold.
+        @param[out] out (numpy.ndarray): Preallocated uint8 matrix of shape (amount of points, amount of points).
+
+        """
+
+        for i in numba.prange(bitsets.shape[0]):
+            for j in range(i + 1, bitsets.shape[0]):
+                intersection, union = 0, 0
+                for w in range(bitsets.shape[1]):
+                    intersection += _popcount64(bitsets[i, w] & bitsets[j, w])
+                    union += _popcount64(bitsets[i, w] | bitsets[j, w])
+
+                if (union > 0) and (intersection >= theta * union):
+                    out[i, j] = 1
+                    out[j, i] = 1
+
+
+def jaccard_similarity(point1, point2):
+    intersection = len(set(point1).intersection(point2))
+    union = (len(point1) + len(point2)) - intersection
+    return float(intersection) / union
+
+
+def _build_membership_matrix(data):
+    """!
+    @brief Builds boolean one-hot matrix where each row encodes which elements of the global element union belong to the corresponding point.
+
+    @param[in] data (list): Input data - list of points where each point is represented by list of elements.
+
+    @return (numpy.ndarray) Boolean matrix of shape (amount of points, size of element union).
+
+    """
+
+    columns = {}
+    for point in data:
+        for element in point:
+            columns.setdefault(element, len(columns))
+
+    membership = numpy.zeros((len(data), len(columns)), dtype=bool)
+    for index, point in enumerate(data):
+        for element in point:
+            membership[index][columns[element]] = True
+
+    return membership
+
+
+def _build_bitsets(data):
+    """!
+    @brief Packs element membership of each point into a dense bitset, i.e. row of uint64 words, so that
+           intersection and union cardinalities are obtained by popcount of bitwise AND/OR.
+    @details The bitsets are built once per dataset and reused across all pairs instead of rebuilding
+             Python sets per pair as jaccard_similarity() does.
+
+    @param[in] data (list): Input data - list of points where each point is represented by list of elements.
+
+    @return (numpy.ndarray) Matrix of uint64 words of shape (amount of points, ceil(size of element union / 64)).
+
+    """
+
+    membership = _build_membership_matrix(data)
+    padding = (-membership.shape[1]) % 64   # pack rows into whole uint64 words
+    if padding > 0:
+        membership = numpy.pad(membership, ((0, 0), (0, padding)))
+
+    return numpy.packbits(membership, axis=1).view(numpy.uint64)
+
+
+def _jaccard_bits(bitset1, bitset2):
+    """!
+    @brief Calculates Jaccard similarity between two points represented by uint64 bitsets.
+
+    @param[in] bitset1 (numpy.ndarray): Bitset of the first point.
+    @param[in] bitset2 (numpy.ndarray): Bitset of the second point.
+
+    @return (double) Jaccard similarity, 0.0 for two empty points.
+
+    """
+
+    union = numpy.bitwise_count(bitset1 | bitset2).sum()
+    if union == 0:
+        return 0.0
+
+    return float(numpy.bitwise_count(bitset1 & bitset2).sum()) / union
+
+def print_tidy_nested_list(nested_list):
+    # single C-level pass instead of one print() dispatch per element.
+    numpy.savetxt(sys.stdout, numpy.asarray(nested_list), fmt='%d', delimiter=' ')
+
+class rock:
+    """!
+    @brief The class represents clustering algorithm ROCK.
+    Example:
+    @code
+        from pyclustering.cluster import cluster_visualizer
+        from pyclustering.cluster.rock import rock
+        from pyclustering.samples.definitions import FCPS_SAMPLES
+        from pyclustering.utils import read_sample
+        # Read sample for clustering from file.
+        sample = read_sample(FCPS_SAMPLES.SAMPLE_HEPTA)
+        # Create instance of ROCK algorithm for cluster analysis. Seven clusters should be allocated.
+        rock_instance = rock(sample, 1.0, 7)
+        # Run cluster analysis.
+        rock_instance.process()
+        # Obtain results of clustering.
+        clusters = rock_instance.get_clusters()
+        # Visualize clustering results.
+        visualizer = cluster_visualizer()
+        visualizer.append_clusters(clusters, sample)
+        visualizer.show()
+    @endcode
+       
+    """
+    
+    def __init__(self, data, number_clusters, metric_function='jaccard_similarity', theta=0.5, matrix_verbose=False, ccore=False, backend='numpy'):
+        """!
+        @brief Constructor of clustering algorithm ROCK.
+
+        @param[in] data (list): Input data - list of points where each point is represented by list of coordinates.
+        @param[in] number_clusters (uint): Defines number of clusters that should be allocated from the input data set.
+        @param[in] theta (double): Value that defines degree of normalization that influences on choice of clusters for merging during processing.
+        @param[in] ccore (bool): Defines should be CCORE (C++ pyclustering library) used instead of Python code or not.
+        @param[in] backend (string): Backend for the links matrix multiplication: 'numpy' (default), 'cupy' or 'torch' to offload the GEMM to GPU.
+
+        """
+
+        self.__pointer_data = data
+        self.__number_clusters = number_clusters
+        self.__metric_function = metric_function
+        self.__theta = theta
+        self.__matrix_verbose = matrix_verbose
+        self.__backend = backend
+        
+        self.__clusters = None
+
+        # single contiguous copy of the numeric points, all distance kernels read it instead
+        # of chasing pointers through the list of lists.
+        if self.__metric_function != 'jaccard_similarity':
+            self.__pointer_data_numpy = numpy.ascontiguousarray(self.__pointer_data, dtype=numpy.float64)
+        else:
+            self.__pointer_data_numpy = None
+
+        self.__ccore = ccore
+        if self.__ccore:
+            self.__ccore = ccore_library.workable()
+
+        self.__degree_normalization = 1.0 + 2.0 * ((1.0 - theta) / (1.0 + theta))
+
+        self.__neighbours_matrix = None
+        self.__create_neighbours_matrix()
+        self.__links_matrix = None
+        self.__create_links_matrix()
+
+        self.__goodness_per_cluster = []
+        if self.__matrix_verbose:
+            print('==> Neighbours Matrix...')
+            print_tidy_nested_list(self.__neighbours_matrix)
+            print('==> Links Matrix...')
+            print_tidy_nested_list(self.__links_matrix)
+
+
+    def process(self):
+        """!
+        @brief Performs cluster analysis in line with rules of ROCK algorithm.
+        @return (rock) Returns itself (ROCK instance).
+        
+        @see get_clusters()
+        
+        """
+        
+        # TODO: (Not related to specification, just idea) First iteration should be investigated. Euclidean distance should be used for clustering between two 
+        # points and rock algorithm between clusters because we consider non-categorical samples. But it is required more investigations.
+        
+        if self.__ccore is True:
+            self.__clusters = wrapper.rock(self.__pointer_data, self.__theta, self.__number_clusters, self.__theta)
+        
+        else:
+            self.__clusters = [[index] for index in range(len(self.__pointer_data))]
+            self.__cluster_links = self.__links_matrix.astype(numpy.float64)
+            self.__cluster_sizes = numpy.ones(len(self.__pointer_data))
+            self.__cluster_size_pow = self.__cluster_sizes ** self.__degree_normalization
+            self.__live_clusters = numpy.ones(len(self.__pointer_data), dtype=bool)
+
+            amount_clusters = len(self.__clusters)
+            while amount_clusters > self.__number_clusters:
+                indexes = self.__find_pair_clusters()
+
+                if indexes != [-1, -1]:
+                    self.__merge_clusters(indexes[0], indexes[1])
+                    amount_clusters -= 1
+                else:
+                    break  # totally separated clusters have been allocated
+
+            self.__clusters = [cluster for cluster in self.__clusters if cluster is not None]
+        for cluster in self.__clusters:
+            # ni*sum(link(p,q))/ni^(1+2f(theta)) where p, q are points of the cluster.
+            indexes = numpy.asarray(cluster)
+            links_submatrix = self.__links_matrix[numpy.ix_(indexes, indexes)]
+            intra_links = (links_submatrix.sum() - numpy.trace(links_submatrix)) / 2.0
+            cluster_goodness_for_this_cluster = len(cluster) * intra_links / (len(cluster) ** self.__degree_normalization)
+            self.__goodness_per_cluster.append(cluster_goodness_for_this_cluster)
+        return self
+
+    
+    def get_clusters(self):
+        """!
+        @brief Returns list of allocated clusters, each cluster contains indexes of objects in list of data.
+        
+        @return (list) List of allocated clusters, each cluster contains indexes of objects in list of data.
+        
+        @see process()
+        
+        """
+        
+        return self.__clusters
+    
+
+    def get_goodness_per_cluster(self):
+        return self.__goodness_per_cluster
+
+
+    def get_cluster_encoding(self):
+        """!
+        @brief Returns clustering result representation type that indicate how clusters are encoded.
+        
+        @return (type_encoding) Clustering result representation.
+        
+        @see get_clusters()
+        
+        """
+        
+        return type_encoding.CLUSTER_INDEX_LIST_SEPARATION
+
+
+    def __find_pair_clusters(self):
+        """!
+        @brief Returns pair of clusters that are best candidates for merging in line with goodness measure.
+               The pair of clusters for which the above goodness measure is maximum is the best pair of clusters to be merged.
+        @details Goodness is computed for all pairs at once as an elementwise expression over the maintained
+                 cluster links matrix instead of calling __calculate_goodness per pair.
+
+        @return (list) List that contains two indexes of clusters (from list 'self.__clusters') that should be merged on this step.
+                It can be equals to [-1, -1] when no links between clusters.
+
+        """
+
+        sizes = self.__cluster_sizes
+        size_pow = self.__cluster_size_pow
+        live = self.__live_clusters
+
+        if NUMBA_AVAILABLE:
+            index1, index2 = _find_best_pair(self.__cluster_links, sizes, size_pow, self.__degree_normalization, live)
+            return [int(index1), int(index2)]
+
+        linked = self.__cluster_links > 0
+        linked[numpy.tril_indices(len(sizes))] = False
+        linked[~live, :] = False
+        linked[:, ~live] = False
+
+        if not linked.any():
+            return [-1, -1]   # totally separated clusters, no need to evaluate goodness
+
+        devider = (sizes[:, numpy.newaxis] + sizes[numpy.newaxis, :]) ** self.__degree_normalization \
+            - size_pow[:, numpy.newaxis] - size_pow[numpy.newaxis, :]
+
+        goodness = numpy.where(linked, self.__cluster_links / devider, -numpy.inf)
+
+        indexes = numpy.unravel_index(numpy.argmax(goodness), goodness.shape)
+        return [int(indexes[0]), int(indexes[1])]
+
+
+    def __merge_clusters(self, index1, index2):
+        """!
+        @brief Merges cluster with 'index2' into cluster with 'index1' and updates the maintained cluster links
+               matrix and cluster sizes incrementally instead of recomputing links from points.
+        @details The merged cluster is tombstoned via the live mask, row and column stay allocated - this avoids
+                 the O(k^2) reallocation of numpy.delete and the O(k) shift of list.pop per merge.
+
+        @param[in] index1 (uint): Index of the cluster that absorbs the other one.
+        @param[in] index2 (uint): Index of the cluster that is merged and removed.
+
+        """
+
+        self.__clusters[index1] += self.__clusters[index2]
+        self.__clusters[index2] = None   # tombstone of merged cluster.
+
+        self.__cluster_links[index1, :] += self.__cluster_links[index2, :]
+        self.__cluster_links[:, index1] += self.__cluster_links[:, index2]
+
+        self.__cluster_sizes[index1] += self.__cluster_sizes[index2]
+        self.__cluster_size_pow[index1] = self.__cluster_sizes[index1] ** self.__degree_normalization
+
+        self.__live_clusters[index2] = False
+
+
+    def __create_neighbours_matrix(self):
+        """!
+        @brief Creates 2D neibours matrix (numpy.ndarray) where each element described existence of link between points (means that points are neighbors).
+        
+        """
+        
+        size_data = len(self.__pointer_data)
+
+        if NUMBA_AVAILABLE:
+            self.__neighbours_matrix = numpy.zeros((size_data, size_data), dtype=numpy.uint8)
+            if self.__metric_function == 'jaccard_similarity':
+                _build_neighbours_jaccard(_build_bitsets(self.__pointer_data), self.__theta, self.__neighbours_matrix)
+            else:
+                _build_neighbours_euclidean(self.__pointer_data_numpy, self.__theta, self.__neighbours_matrix)
+            return
+
+        if self.__metric_function == 'jaccard_similarity':
+            bitsets = _build_bitsets(self.__pointer_data)
+            condensed = numpy.zeros(size_data * (size_data - 1) // 2, dtype=numpy.uint8)
+            offset = 0
+            for i in range(size_data - 1):
+                rest = bitsets[i + 1:]
+                intersection = numpy.bitwise_count(bitsets[i] & rest).sum(axis=1)
+                union = numpy.bitwise_count(bitsets[i] | rest).sum(axis=1)
+                similarity = numpy.divide(intersection, union, out=numpy.zeros(len(rest)), where=(union > 0))
+                condensed[offset:offset + len(rest)] = similarity >= self.__theta
+                offset += len(rest)
+        else:
+            # comparing squared distances against theta^2 is equivalent and skips a sqrt per pair.
+            condensed = (pdist(self.__pointer_data_numpy, metric='sqeuclidean') <= self.__theta * self.__theta).astype(numpy.uint8)
+
+        # the condensed form holds only the C(n, 2) upper triangle, symmetrization happens once here
+        # and the diagonal stays zero by construction.
+        self.__neighbours_matrix = squareform(condensed)
+
+
+    def __create_links_matrix(self):
+        """!
+        @brief Creates 2D links matrix (numpy.ndarray) where each element described links between two points
+        @details The matrix is the square of the neighbours matrix, so the whole computation is performed by one
+                 matrix multiplication - BLAS GEMM by default or a GPU GEMM when 'cupy' or 'torch' backend is requested.
+
+        """
+        if self.__backend == 'cupy':
+            import cupy
+            neighbours = cupy.asarray(self.__neighbours_matrix, dtype=cupy.float32)   # counts are exact small integers in float32
+            self.__links_matrix = cupy.asnumpy((neighbours @ neighbours).astype(cupy.int32))
+        elif self.__backend == 'torch':
+            import torch
+            neighbours = torch.as_tensor(self.__neighbours_matrix.astype(numpy.float32))
+            if torch.cuda.is_available():
+                neighbours = neighbours.cuda()
+            self.__links_matrix = (neighbours @ neighbours).to(torch.int32).cpu().numpy()
+        elif self.__backend == 'numpy':
+            if len(self.__neighbours_matrix) <= 16:
+                # for tiny inputs einsum is on par with syrk and keeps the counts in integer
+                # dtype without any float round-trip.
+                neighbours = self.__neighbours_matrix.astype(numpy.int32)
+                self.__links_matrix = numpy.einsum('ik,kj->ij', neighbours, neighbours, optimize=True)
+            else:
+                # the neighbours matrix is symmetric, so N @ N == N @ N.T and BLAS syrk computes
+                # only the upper triangle of the product - half the FLOPs of a general GEMM.
+                product = dsyrk(1.0, self.__neighbours_matrix.astype(numpy.float64))
+                self.__links_matrix = (numpy.triu(product) + numpy.triu(product, 1).T).astype(numpy.int32)
+        else:
+            raise ValueError("Unknown backend '%s' (available: 'numpy', 'cupy', 'torch')." % self.__backend)
+
+    def __verify_arguments(self):
+        """!
+        @brief Verify input parameters for the algorithm and throw exception in case of incorrectness.
+        """
+        if len(self.__pointer_data) == 0:
+            raise ValueError("Input data is empty (size: '%d')." % len(self.__pointer_data))
+
+        if self.__theta < 0:
+            raise ValueError("Connectivity radius (current value: '%d') should be greater or equal to 0." % self.__theta)
+
+        if self.__theta < 0 or self.__theta > 1:
+            raise ValueError("theta (current value: '%d') should be in range (0, 1)." % self.__theta)
+
+        if (self.__number_clusters is not None) and (self.__number_clusters <= 0):
+            raise ValueError("Amount of clusters (current value: '%d') should be greater than 0." %
                              self.__number_clusters)
\ No newline at end of file